@@ -1,14 +1,53 @@
 # Calculate taylor rule and sensitivity analysis
 
 from statsmodels.stats.diagnostic import acorr_breusch_godfrey
+import numpy as np
 import pandas as pd
+import scipy.linalg
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @njit(cache=True)
+    def _build_bg_design(resid, exog, nlags):
+        """Design matrix [exog, resid_{t-1..t-nlags}] for the BG auxiliary regression.
+
+        Lagged residuals are zero-padded like statsmodels does, so the resulting
+        statistic matches acorr_breusch_godfrey exactly.
+        """
+        n = resid.shape[0]
+        k = exog.shape[1]
+        x_aux = np.zeros((n, k + nlags))
+        x_aux[:, :k] = exog
+        for lag in range(1, nlags + 1):
+            x_aux[lag:, k + lag - 1] = resid[:-lag]
+        return x_aux
+
+
+def _bg_lm(resid, exog, nlags):
+    """Breusch-Godfrey LM statistic (n * R^2 of the auxiliary regression).
+
+    The JIT-built design goes straight to LAPACK's least-squares driver,
+    skipping statsmodels' model/result wrapping on the hot analysis path.
+    """
+    x_aux = _build_bg_design(resid, exog, nlags)
+    coeffs = scipy.linalg.lstsq(x_aux, resid, lapack_driver='gelsy')[0]
+    resid_aux = resid - x_aux @ coeffs
+    ssr = resid_aux @ resid_aux
+    centered = resid - resid.mean()
+    return resid.shape[0] * (1.0 - ssr / (centered @ centered))
+
 
 class analyze:
     """Class to calculate the Taylor rule and perform sensitivity analysis."""
-    
+
     def __init__(self, results):
         self.results = results
-    
+
     def estructural_params(self):
         """Extract coefficients from the regression results."""
         alpha1 = self.results.params['selic_target_lag']
@@ -17,10 +56,14 @@ class analyze:
         alpha4 = self.results.params.get('exchange_rate_var_lag', 0)/(1-alpha1)
         return alpha1, alpha2, alpha3, alpha4
 
-    def lm_value(self):
-        """Calculate the LM test for autocorrelation."""
-        lm_test = acorr_breusch_godfrey(self.results, nlags=4)
-        return lm_test[3]  # LM statistic
+    def lm_value(self, nlags: int = 4):
+        """Calculate the LM test statistic for autocorrelation."""
+        if _HAS_NUMBA:
+            resid = np.asarray(self.results.resid, dtype=np.float64)
+            exog = np.asarray(self.results.model.exog, dtype=np.float64)
+            return _bg_lm(resid, exog, nlags)
+        lm_test = acorr_breusch_godfrey(self.results, nlags=nlags)
+        return lm_test[0]  # LM statistic
 
     def summarize_results(self):
         """Summarize the regression results."""
@@ -28,7 +71,7 @@ class analyze:
         alpha1, alpha2, alpha3, alpha4 = self.estructural_params()
         test = self.results.t_test("inf_dev + selic_target_lag = 1")
         lm_stat = self.lm_value()
-        
+
         summary_text = f"""
         Taylor Rule Estimation Results:
         -------------------------------
@@ -36,9 +79,9 @@ class analyze:
         Coefficient on Inflation Deviation (alpha2): {alpha2:.4f}
         Coefficient on Output Gap (alpha3): {alpha3:.4f}
         Coefficient on Exchange Rate Variation (alpha4): {alpha4:.4f}
-        
+
         LM Test Statistic for Autocorrelation: {lm_stat:.4f}
-        
+
         T-Test Statistic for alpha2 > 1: {test}
 
         Full Regression Summary:
@@ -1,22 +1,32 @@
 # Data ingestion module
 import requests
-import yaml
 import pandas as pd
 
+from src.utils import load_yaml_config
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+
 def fetch_atas(endpoint, key: str = 'conteudo') -> dict:
     """Fetch data from the given API endpoint."""
 
-    response = requests.get(endpoint)
+    response = requests.get(endpoint, stream=True)
     response.raise_for_status() # Raise an error for bad responses
 
+    if _HAS_ORJSON:
+        return orjson.loads(response.content)[key]
     return response.json()[key]
 
 class Loader:
     """Class for loading different types of data."""
-    def __init__(self, folder_path: str):
+    def __init__(self, folder_path: str, config: dict = None):
         self.folder_path = folder_path
-        with open('./config/config.yaml', 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Prefer the config the caller already parsed; fall back to the cached parse
+        self.config = config if config is not None else load_yaml_config('./config/config.yaml')
     
     def load(self):  
         raise NotImplementedError("Load method must be implemented in subclasses.")
@@ -25,16 +35,21 @@ class FocusLoader(Loader):
     def load(self) -> pd.DataFrame:
         """Load Focus expected inflation data from CSV files in the specified folder."""
         pattern = self.config['files_patterns']['focus_expected_inflation']
-        from glob import glob
-        files_list = glob(self.folder_path + pattern)
+        from pathlib import Path
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        # Sorted so the frame's column order is stable regardless of
+        # filesystem enumeration order
+        files_list = sorted(str(path) for path in Path(self.folder_path).glob(pattern))
         if not files_list:
             raise FileNotFoundError(f"No expected inflation CSV files found in the specified folder. (searched in: {self.folder_path} by pattern '{pattern}')")
-        
-        df_concatenated = pd.DataFrame()
-        for file in files_list:
-            df = pd.read_csv(file)
-            df_concatenated = pd.concat([df_concatenated, df], ignore_index=True)
-        return df_concatenated
+
+        # Arrow's threaded CSV reader per file, then a permissive concat that
+        # unions the schemas: the files disagree on columns (the 2019-2025 one
+        # adds the 13-24 month horizons) and a plain dataset scan would keep
+        # only the first fragment's columns
+        tables = [pacsv.read_csv(path) for path in files_list]
+        return pa.concat_tables(tables, promote_options='permissive').to_pandas()
 
 class BCBExpectationsLoader(Loader):
     def load(self) -> pd.DataFrame:
@@ -46,7 +61,7 @@ class BCBExpectationsLoader(Loader):
         file_path = self.folder_path + pattern
         if not file_path:
             raise FileNotFoundError(f"No BC expectations CSV file found in the specified folder. (searched in: {self.folder_path} by pattern '{pattern}')")
-        df = pd.read_csv(file_path)       
+        df = pd.read_csv(file_path, engine='pyarrow', dtype={'Date': str})
         return df
     
 class SelicRateLoader(Loader):
@@ -59,7 +74,8 @@ class SelicRateLoader(Loader):
         file_path = self.folder_path + pattern
         if not file_path:
             raise FileNotFoundError(f"No Selic rate CSV file found in the specified folder. (searched in: {self.folder_path} by pattern '{pattern}')")
-        df = pd.read_csv(file_path, sep=";")       
+        # Decimal-comma values: keep everything str, processing converts later
+        df = pd.read_csv(file_path, sep=";", engine='pyarrow', dtype=str)
         return df
     
 class ExchangeLoader(Loader):
@@ -72,7 +88,7 @@ class ExchangeLoader(Loader):
         file_path = self.folder_path + pattern
         if not file_path:
             raise FileNotFoundError(f"No exchange rate CSV file found in the specified folder. (searched in: {self.folder_path} by pattern '{pattern}')")
-        df = pd.read_csv(file_path, sep=";")
+        df = pd.read_csv(file_path, sep=";", engine='pyarrow', dtype=str)
         return df
     
 class OutputLoader(Loader):
@@ -85,7 +101,7 @@ class OutputLoader(Loader):
         file_path = self.folder_path + pattern
         if not file_path:
             raise FileNotFoundError(f"No output gap CSV file found in the specified folder. (searched in: {self.folder_path} by pattern '{pattern}')")
-        df = pd.read_csv(file_path, names=['Date', 'output'], header=0)       
+        df = pd.read_csv(file_path, names=['Date', 'output'], header=0, engine='pyarrow', dtype={'Date': str, 'output': float})
         return df
 
 class InflationTargetLoader(Loader):
@@ -98,7 +114,7 @@ class InflationTargetLoader(Loader):
         file_path = self.folder_path + pattern
         if not file_path:
             raise FileNotFoundError(f"No inflation target CSV file found in the specified folder. (searched in: {self.folder_path} by pattern '{pattern}')")
-        df = pd.read_csv(file_path, sep=",")       
+        df = pd.read_csv(file_path, sep=",", engine='pyarrow', dtype={'Date': str})
         return df
     
 class InflationLoader(Loader):
@@ -111,5 +127,5 @@ class InflationLoader(Loader):
         file_path = self.folder_path + pattern
         if not file_path:
             raise FileNotFoundError(f"No inflation CSV file found in the specified folder. (searched in: {self.folder_path} by pattern '{pattern}')")
-        df = pd.read_csv(file_path, sep=";")       
+        df = pd.read_csv(file_path, sep=";", engine='pyarrow', dtype=str)
         return df
\ No newline at end of file
@@ -8,11 +8,32 @@ import yaml
 from typing import Dict, List
 import logging
 
-from src.utils import log_execution, safe_load, DataLoadError, PipelineError, print_summary
+from src.utils import log_execution, safe_load, load_yaml_config, CacheManager, DataLoadError, PipelineError, print_summary
 
 logger = logging.getLogger(__name__)
 
 
+def _estimate_task(data, source, lag, mask=None, dummy_range=None):
+    """Worker-side Taylor Rule estimation for the parallel sweep.
+
+    Module-level and handed only the prepared frame plus the task arguments,
+    so loky pickles just those instead of the bound Pipeline method, which
+    would drag every fetched DataFrame into each task. Logging happens in
+    the parent when results are collected; worker processes have no
+    configured handlers.
+    """
+    import src.estimation as estimation
+    try:
+        estimator = estimation.TaylorRuleEstimator(data=data, source=source, lag=lag, prepared=True)
+        if mask is not None:
+            results = estimator.fit_models(function=estimator.estimate_with_mask(mask, dummy_range))
+        else:
+            results = estimator.fit_models()
+        return (estimator, *results)
+    except Exception as e:
+        raise PipelineError(f"Failed to estimate Taylor Rule: {str(e)}") from e
+
+
 class Pipeline:
     """Orchestrates the complete data pipeline."""
     
@@ -25,13 +46,52 @@ class Pipeline:
         self.config_path = config_path
         self.config = self._load_config()
         self.data = {}
+        if self.config['processing'].get('use_cache', False):
+            self._cache = CacheManager(self.config['paths'].get('cache_data', './data/cache'))
+        else:
+            self._cache = None
+        # Per-stage CSVs are redundant in end-to-end runs: frames are handed
+        # downstream in memory and the Parquet cache covers persistence, so
+        # only the final merged dataset is written unless explicitly asked for
+        self._save_intermediate = (self.config['processing']['save_files']
+                                   and self.config['processing'].get('save_intermediate_files', True))
+
+    def _cached_fetch(self, name: str, pattern_key: str, builder, config_keys=(), extra=None, csv_name=None):
+        """Run a fetch stage through the Parquet cache when enabled.
+
+        Args:
+            name: Stage key used in self.data and in the cache
+            pattern_key: files_patterns entry naming the stage's source files
+            builder: Zero-argument callable producing the stage's DataFrame
+            config_keys: processing-config entries the stage output depends on
+            extra: key material for non-file inputs (e.g. an HTTP payload digest)
+            csv_name: per-stage CSV artifact filename under paths.processed_data
+        """
+        df = None
+        key = None
+        if self._cache is not None:
+            from glob import glob
+            sources = glob(self.config['paths']['raw_data'] + self.config['files_patterns'][pattern_key])
+            config_subset = {k: self.config['processing'].get(k) for k in config_keys}
+            key = self._cache.key(name, sources, config_subset, extra=extra)
+            df = self._cache.get(key)
+        if df is None:
+            df = builder()
+            if self._cache is not None:
+                self._cache.put(key, df)
+        if self._save_intermediate and csv_name:
+            # Written here rather than inside the builder: a cache hit skips
+            # the builder, and the artifact must still land when asked for
+            import src.processing as processing
+            processing._write_csv(df, self.config['paths']['processed_data'] + csv_name)
+        self.data[name] = df
+        return df
         
     def _load_config(self) -> dict:
         """Load configuration from YAML file."""
         try:
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            logger.info(f"Configuration loaded from {self.config_path}")
+            config = load_yaml_config(self.config_path)
+            logger.info("Configuration loaded from %s", self.config_path)
             return config
         except FileNotFoundError as e:
             raise DataLoadError(f"Config file not found: {self.config_path}") from e
@@ -47,23 +107,30 @@ class Pipeline:
         try:
             bcb_endpoint = self.config['ingestion']['bcb_endpoint_atas']
             raw_data_path = self.config['paths']['raw_data']
-            save_files = self.config['processing']['save_files']
             
-            # Fetch atas metadata
+            # Fetch atas metadata before the cache lookup: the endpoint is the
+            # stage's primary input, so its payload goes into the cache key and
+            # a newly published Copom meeting invalidates the entry even while
+            # the local Focus files are unchanged (the GET is cheap next to the
+            # CSV scan)
             atas_data = ingestion.fetch_atas(bcb_endpoint)
-            logger.info(f"Fetched {len(atas_data)} Copom meetings")
-            
-            # Load Focus expectations
-            focus_df = ingestion.FocusLoader(raw_data_path).load()
-            logger.info(f"Loaded Focus data with shape {focus_df.shape}")
-            
-            # Filter by meeting dates
-            filtered_df = processing.filter_expected_inflation_dates(
-                atas_data, focus_df, save_files
-            )
-            self.data['focus_expectations'] = filtered_df
-            logger.info(f"Filtered to {len(filtered_df)} records on Copom eve dates")
-            return filtered_df
+            logger.info("Fetched %d Copom meetings", len(atas_data))
+
+            def build():
+                # Load Focus expectations
+                focus_df = ingestion.FocusLoader(raw_data_path, self.config).load()
+                logger.info("Loaded Focus data with shape %s", focus_df.shape)
+
+                # Filter by meeting dates
+                filtered_df = processing.filter_expected_inflation_dates(
+                    atas_data, focus_df, False
+                )
+                logger.info("Filtered to %d records on Copom eve dates", len(filtered_df))
+                return filtered_df
+
+            return self._cached_fetch('focus_expectations', 'focus_expected_inflation', build,
+                                      extra=repr(atas_data),
+                                      csv_name='focus_expected_inflation_filtered.csv')
             
         except Exception as e:
             raise PipelineError(f"Failed to fetch Focus expectations: {str(e)}") from e
@@ -76,16 +143,17 @@ class Pipeline:
         
         try:
             raw_data_path = self.config['paths']['raw_data']
-            save_files = self.config['processing']['save_files']
-            
-            bcb_df = ingestion.BCBExpectationsLoader(raw_data_path).load()
-            logger.info(f"Loaded BCB data with shape {bcb_df.shape}")
             
-            interpolated_df = processing.interpolate_quartely_data(
-                bcb_df, 'Infl. 12 m.', save_files
-            )
-            self.data['bcb_expectations'] = interpolated_df
-            return interpolated_df
+            def build():
+                bcb_df = ingestion.BCBExpectationsLoader(raw_data_path, self.config).load()
+                logger.info("Loaded BCB data with shape %s", bcb_df.shape)
+
+                return processing.interpolate_quartely_data(
+                    bcb_df, 'Infl. 12 m.', False
+                )
+
+            return self._cached_fetch('bcb_expectations', 'bcb_expected_inflation', build,
+                                      csv_name='bcb_expectations_interpolated.csv')
             
         except Exception as e:
             raise PipelineError(f"Failed to fetch BCB expectations: {str(e)}") from e
@@ -98,16 +166,17 @@ class Pipeline:
         
         try:
             raw_data_path = self.config['paths']['raw_data']
-            save_files = self.config['processing']['save_files']
-            
-            selic_df = ingestion.SelicRateLoader(raw_data_path).load()
-            logger.info(f"Loaded Selic data with shape {selic_df.shape}")
             
-            monthly_df = processing.resample_daily_to_monthly(
-                selic_df, 'selic_rate', save_files
-            )
-            self.data['selic_rate'] = monthly_df
-            return monthly_df
+            def build():
+                selic_df = ingestion.SelicRateLoader(raw_data_path, self.config).load()
+                logger.info("Loaded Selic data with shape %s", selic_df.shape)
+
+                return processing.resample_daily_to_monthly(
+                    selic_df, 'selic_rate', False
+                )
+
+            return self._cached_fetch('selic_rate', 'selic_target_rate', build,
+                                      csv_name='selic_target_monthly.csv')
             
         except Exception as e:
             raise PipelineError(f"Failed to fetch Selic rate: {str(e)}") from e
@@ -120,14 +189,15 @@ class Pipeline:
         
         try:
             raw_data_path = self.config['paths']['raw_data']
-            save_files = self.config['processing']['save_files']
             
-            exchange_df = ingestion.ExchangeLoader(raw_data_path).load()
-            logger.info(f"Loaded exchange rate data with shape {exchange_df.shape}")
-            
-            processed_df = processing.process_exchange_rate_data(exchange_df, save_files)
-            self.data['exchange_rate'] = processed_df
-            return processed_df
+            def build():
+                exchange_df = ingestion.ExchangeLoader(raw_data_path, self.config).load()
+                logger.info("Loaded exchange rate data with shape %s", exchange_df.shape)
+
+                return processing.process_exchange_rate_data(exchange_df, False)
+
+            return self._cached_fetch('exchange_rate', 'exchange_rate', build,
+                                      csv_name='exchange_rate_var.csv')
             
         except Exception as e:
             raise PipelineError(f"Failed to fetch exchange rate: {str(e)}") from e
@@ -140,15 +210,16 @@ class Pipeline:
         
         try:
             raw_data_path = self.config['paths']['raw_data']
-            save_files = self.config['processing']['save_files']
             hp_lambda = self.config['processing']['hp_filter_lambda']
             
-            output_df = ingestion.OutputLoader(raw_data_path).load()
-            logger.info(f"Loaded output data with shape {output_df.shape}")
-            
-            filtered_df = processing.hp_filter_output(output_df, 'output', hp_lambda, save_files)
-            self.data['output_gap'] = filtered_df
-            return filtered_df
+            def build():
+                output_df = ingestion.OutputLoader(raw_data_path, self.config).load()
+                logger.info("Loaded output data with shape %s", output_df.shape)
+
+                return processing.hp_filter_output(output_df, 'output', hp_lambda, False)
+
+            return self._cached_fetch('output_gap', 'output_proxy', build, config_keys=('hp_filter_lambda',),
+                                      csv_name='output_gap_hp_filter.csv')
             
         except Exception as e:
             raise PipelineError(f"Failed to fetch output gap: {str(e)}") from e
@@ -161,14 +232,15 @@ class Pipeline:
         
         try:
             raw_data_path = self.config['paths']['raw_data']
-            save_files = self.config['processing']['save_files']
-            
-            target_df = ingestion.InflationTargetLoader(raw_data_path).load()
-            logger.info(f"Loaded inflation target data with shape {target_df.shape}")
             
-            monthly_df = processing.resample_annualy_to_monthly(target_df, save_files)
-            self.data['inflation_target'] = monthly_df
-            return monthly_df
+            def build():
+                target_df = ingestion.InflationTargetLoader(raw_data_path, self.config).load()
+                logger.info("Loaded inflation target data with shape %s", target_df.shape)
+
+                return processing.resample_annualy_to_monthly(target_df, False)
+
+            return self._cached_fetch('inflation_target', 'inflation_target', build,
+                                      csv_name='inflation_target_monthly.csv')
             
         except Exception as e:
             raise PipelineError(f"Failed to fetch inflation target: {str(e)}") from e
@@ -180,33 +252,38 @@ class Pipeline:
         
         try:
             raw_data_path = self.config['paths']['raw_data']
-            save_files = self.config['processing']['save_files']
-            
-            inflation_df = ingestion.InflationLoader(raw_data_path).load()
-            logger.info(f"Loaded inflation data with shape {inflation_df.shape}")
             
-            processed_df = processing.process_inflation(inflation_df, save_files)
-            self.data['inflation'] = processed_df
-            return processed_df
+            def build():
+                inflation_df = ingestion.InflationLoader(raw_data_path, self.config).load()
+                logger.info("Loaded inflation data with shape %s", inflation_df.shape)
+
+                return processing.process_inflation(inflation_df, False)
+
+            return self._cached_fetch('inflation', 'inflation_data', build,
+                                      csv_name='inflation_12m.csv')
             
         except Exception as e:
             raise PipelineError(f"Failed to fetch inflation data: {str(e)}") from e
     
     @log_execution
-    def estimate_taylor_rule(self, data: pd.DataFrame, source = "market", year_range: tuple = None, dummy_range = None) -> pd.DataFrame:
+    def estimate_taylor_rule(self, data: pd.DataFrame, source = "market", year_range: tuple = None, dummy_range = None, prepared: bool = False, mask = None) -> pd.DataFrame:
         """Estimate Taylor Rule interest rates.
-        
+
         Args:
             df: Merged dataset containing necessary variables
             source: Source of inflation expectations ('market' or 'bcb')
-        
+            prepared: data was already lagged via TaylorRuleEstimator._prepare
+            mask: precomputed boolean year mask aligned with the prepared frame
+
         Returns:
             DataFrame with estimated Taylor Rule rates
         """
         import src.estimation as estimation
         try:
-            estimator = estimation.TaylorRuleEstimator(data=data, source=source, lag=int(self.config['estimation']['lag']))
-            if not year_range:
+            estimator = estimation.TaylorRuleEstimator(data=data, source=source, lag=int(self.config['estimation']['lag']), prepared=prepared)
+            if mask is not None:
+                results_i, results_ii, results_iii = estimator.fit_models(function=estimator.estimate_with_mask(mask, dummy_range))
+            elif not year_range:
                 results_i, results_ii, results_iii = estimator.fit_models()
             else:
                 if dummy_range:
@@ -232,22 +309,28 @@ class Pipeline:
         logger.info("=" * 50)
         
         try:
-            # Fetch all data sources in sequence
-            dfs = [
-                self.fetch_focus_expectations(),
-                self.fetch_bcb_expectations(),
-                self.fetch_selic_rate(),
-                self.fetch_exchange_rate(),
-                self.fetch_output_gap(),
-                self.fetch_inflation_target(),
-                self.fetch_inflation()
+            # Fetch all data sources concurrently (one HTTP GET plus CSV loads,
+            # all I/O-bound and independent); the list order fixes the merge order
+            from concurrent.futures import ThreadPoolExecutor
+
+            stages = [
+                self.fetch_focus_expectations,
+                self.fetch_bcb_expectations,
+                self.fetch_selic_rate,
+                self.fetch_exchange_rate,
+                self.fetch_output_gap,
+                self.fetch_inflation_target,
+                self.fetch_inflation
             ]
+            with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+                futures = [executor.submit(stage) for stage in stages]
+                dfs = [future.result() for future in futures]
             
             # Merge datasets
             logger.info("Merging datasets...")
             save_files = self.config['processing']['save_files']
             df_merged = processing.merge_datasets(dfs, save_files)
-            logger.info(f"Merged dataset shape: {df_merged.shape}")
+            logger.info("Merged dataset shape: %s", df_merged.shape)
             
             # Calculate deviation from target
             logger.info("Calculating deviation from inflation target...")
@@ -262,38 +345,59 @@ class Pipeline:
             return df_final
         
         except Exception as e:
-            logger.error(f"Pipeline execution failed: {str(e)}", exc_info=True)
+            logger.error("Pipeline execution failed: %s", e, exc_info=True)
             raise
         
     def run_estimation(self, df_final: pd.DataFrame = None):
         """Run Taylor Rule estimation on the final dataset."""
+        from joblib import Parallel, delayed
+        import src.estimation as estimation
+
         try:
             if df_final is None:
                 df_final = self.run()
             estimator = dict()
             results = dict()
             ranges = self.config['estimation']['year_ranges']
+            # Lag and materialise the source column once per source; every
+            # estimator instance then shares the prepared frame
+            lag = int(self.config['estimation']['lag'])
+            prepared = {
+                source: estimation.TaylorRuleEstimator._prepare(df_final, source, lag)
+                for source in ("market", "bc")
+            }
+            # Year masks depend only on 'ano', which both prepared frames share,
+            # so each range's mask is computed once and reused across sources
+            ano = prepared['market']['ano'].to_numpy()
+            masks = {}
+            tasks = []
             for year_range in ranges or [None]:
                 normalized_range = tuple((year_range['start'], year_range['end'])) if year_range else None
+                dummy_range = year_range.get('dummy_range') if year_range else None
+                if normalized_range and normalized_range not in masks:
+                    masks[normalized_range] = (ano >= normalized_range[0]) & (ano <= normalized_range[1])
                 for i in range(2):
                     source = "market" if i == 0 else "bc"
-                    est, *res = self.estimate_taylor_rule(
-                        data=df_final,
-                        source=source,
-                        year_range=normalized_range,
-                        dummy_range=year_range.get('dummy_range') if year_range else None
-                    )
-                    estimator[(source, normalized_range)] = est
-                    results[(source, normalized_range)] = res
-                    logger.info(
-                        f"Taylor Rule estimation results for source '{source}' and year range '{normalized_range}':"
-                    )
+                    tasks.append((source, normalized_range, dummy_range))
+            # Each (source, year_range) estimation is independent, so spread them across cores
+            outputs = Parallel(n_jobs=-1, backend='loky')(
+                delayed(_estimate_task)(prepared[source], source, lag,
+                                        masks.get(normalized_range), dummy_range)
+                for source, normalized_range, dummy_range in tasks
+            )
+            for (source, normalized_range, _), (est, *res) in zip(tasks, outputs):
+                estimator[(source, normalized_range)] = est
+                results[(source, normalized_range)] = res
+                logger.info(
+                    "Completed Taylor Rule estimation for source '%s' and year range '%s'",
+                    source, normalized_range
+                )
             logger.info("Taylor Rule estimation results obtained.")
-            
+
             return results
             
         except Exception as e:
-            logger.error(f"Pipeline execution failed: {str(e)}", exc_info=True)
+            logger.error("Pipeline execution failed: %s", e, exc_info=True)
             raise
 
     def run_analysis(self, results: Dict) -> Dict:
@@ -313,10 +417,10 @@ class Pipeline:
                 analysis = analytics.analyze(res_list[-1])  # Analyze the most complex model
                 summary_text = analysis.summarize_results()
                 analysis_summaries[key] = summary_text
-                logger.info(f"Analysis summary for {key}:\n{summary_text}")
+                logger.info("Analysis summary for %s:\n%s", key, summary_text)
             return analysis_summaries
         except Exception as e:
-            logger.error(f"Analysis execution failed: {str(e)}", exc_info=True)
+            logger.error("Analysis execution failed: %s", e, exc_info=True)
             raise
 
     def run_visualization(self, df_final: pd.DataFrame = None):
@@ -337,5 +441,5 @@ class Pipeline:
             plotter.plot_output_and_exchange(load_data=self.config['visualization']['save_plots'])
             logger.info("Inflation plot generated.")
         except Exception as e:
-            logger.error(f"Visualization execution failed: {str(e)}", exc_info=True)
+            logger.error("Visualization execution failed: %s", e, exc_info=True)
             raise
\ No newline at end of file
@@ -1,7 +1,102 @@
 # Processing module
+import numpy as np
 import pandas as pd
+from statsmodels.tsa.filters.hp_filter import hpfilter
+from functools import lru_cache
 from typing import Literal
 
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    _HAS_PYARROW_CSV = True
+except ImportError:
+    _HAS_PYARROW_CSV = False
+
+if _HAS_NUMBA:
+    @njit(cache=True)
+    def _deviation(mes, expected, target, target_next):
+        """Fused weighted-deviation kernel: one pass over the arrays instead
+        of one intermediate array per pandas/NumPy operation.
+
+        (fastmath/parallel deliberately off: the inputs carry NaNs that must
+        propagate, and the panels are a few hundred rows.)
+        """
+        out = np.empty_like(expected)
+        for i in range(expected.shape[0]):
+            weight_next = mes[i] / 12.0
+            out[i] = ((1.0 - weight_next) * (expected[i] - target[i])
+                      + weight_next * (expected[i] - target_next[i]))
+        return out
+
+
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    """Write a processed frame through Arrow's threaded CSV encoder.
+
+    Falls back to the pandas writer when pyarrow is absent or the frame
+    carries a dtype Arrow cannot encode to CSV (e.g. a Period 'Date').
+    """
+    if _HAS_PYARROW_CSV:
+        try:
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+            return
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, TypeError):
+            pass
+    df.to_csv(path, index=False)
+
+
+@lru_cache(maxsize=None)
+def _monthly_index(start, end) -> pd.DatetimeIndex:
+    """Month-start index shared by the monthly-grid stages.
+
+    Memoized so stages covering the same span reindex against one cached
+    DatetimeIndex instead of each resample rebuilding its own grid.
+    """
+    return pd.date_range(start, end, freq='MS', name='Date')
+
+
+def _rename_col(df: pd.DataFrame, idx: int, name: str) -> pd.DataFrame:
+    """Rename the column at position idx through set_axis.
+
+    Writing into df.columns.values mutates the Index's numpy buffer behind
+    its cached hash table; set_axis builds a fresh Index (lazy-copy frame
+    under copy-on-write) so later column lookups stay consistent.
+    """
+    cols = list(df.columns)
+    cols[idx] = name
+    return df.set_axis(cols, axis=1, copy=False)
+
+
+def _pct_change_100(arr: np.ndarray) -> np.ndarray:
+    """Month-over-month percentage change, fused into in-place NumPy ops.
+
+    Matches pct_change(fill_method=None) * 100 without its two intermediate
+    Series: one pre-allocated output, divide into it, subtract and scale
+    in place. NaN gaps propagate through the division as before.
+    """
+    var = np.empty_like(arr, dtype=float)
+    if var.size:
+        var[0] = np.nan
+        np.divide(arr[1:], arr[:-1], out=var[1:])
+        var[1:] -= 1
+        var *= 100
+    return var
+
+
+def _decimal_comma_to_float(series: pd.Series) -> pd.Series:
+    """Convert a decimal-comma string column to float64.
+
+    Routes the replace through Arrow's vectorised substring kernel instead
+    of the per-cell Python .str loop, then parses with the C numeric parser.
+    """
+    converted = series.astype('string[pyarrow]').str.replace(',', '.', regex=False)
+    return pd.to_numeric(converted, errors='coerce').astype('float64')
+
 
 def filter_expected_inflation_dates(atas_data, df_expected, load_data: bool) -> pd.Series:
     """Filter expected inflation dates.
@@ -13,21 +108,23 @@ def filter_expected_inflation_dates(atas_data, df_expected, load_data: bool) ->
     """
 
     df = pd.DataFrame(atas_data)
-    dates = pd.to_datetime(df['dataReferencia'])
-    eve_dates = dates - pd.Timedelta(days=1) 
-    df_expected['Date'] = pd.to_datetime(df_expected['Date'], dayfirst=True)
-    df_expected.columns.values[1] = 'focus_expected_inflation'
-
-    filtered_df = df_expected[df_expected['Date'].isin(eve_dates)]
-    # Recursively search for eve dates, falling back to previous days if not found
-    for offset in range(1, 8):  # Search up to 7 days back
-        if len(filtered_df) > 0:
-            break
-        fallback_dates = dates - pd.Timedelta(days=offset)
-        filtered_df = df_expected[df_expected['Date'].isin(fallback_dates)]
+    dates = pd.to_datetime(df['dataReferencia'], cache=True)
+    eve_dates = (dates - pd.Timedelta(days=1)).sort_values()
+    df_expected['Date'] = pd.to_datetime(df_expected['Date'], format='%d/%m/%Y', cache=True)
+    df_expected = _rename_col(df_expected, 1, 'focus_expected_inflation')
+    df_expected = df_expected.sort_values('Date')
+
+    # One backward merge on the sorted dates replaces the per-offset isin
+    # scans: each meeting takes the latest expectation collected up to 7 days
+    # before its eve
+    eve_df = pd.DataFrame({'eve_date': eve_dates.to_numpy()})
+    filtered_df = pd.merge_asof(
+        eve_df, df_expected, left_on='eve_date', right_on='Date',
+        direction='backward', tolerance=pd.Timedelta(days=7)
+    ).dropna(subset=['Date']).drop(columns='eve_date')
 
     if load_data:
-        filtered_df.to_csv('./data/processed/focus_expected_inflation_filtered.csv', index=False)
+        _write_csv(filtered_df, './data/processed/focus_expected_inflation_filtered.csv')
 
     return filtered_df
 
@@ -38,15 +135,25 @@ def interpolate_quartely_data(df: pd.DataFrame, column: str, load_data: bool) ->
     
     when use: process bcb expectations data
     """
-    df['Date'] = pd.to_datetime(df['Date'], format='%m/%Y')
+    df['Date'] = pd.to_datetime(df['Date'], format='%m/%Y', cache=True)
     df[column] = pd.to_numeric(df[column], errors='coerce')
     df.set_index('Date', inplace=True)
-    df = df.resample('MS').asfreq() # Resample to monthly frequency (NaN for missing months)
-    df[column] = df[column].interpolate(method='linear') # Linear interpolation
+    # Reindex to monthly frequency (NaN for missing months) against the
+    # shared month-start grid; the quarterly stamps are exact month starts
+    df = df.reindex(_monthly_index(df.index.min(), df.index.max()))
+    # One np.interp call over the row positions instead of Series.interpolate's
+    # per-gap dispatch; positions match method='linear', which treats the rows
+    # as equally spaced. Leading NaNs stay NaN, as interpolate leaves them
+    y = df[column].to_numpy(dtype=float)
+    known = np.flatnonzero(~np.isnan(y))
+    if known.size:
+        interpolated = np.interp(np.arange(len(y)), known, y[known])
+        interpolated[:known[0]] = np.nan
+        df[column] = interpolated
     df.reset_index(inplace=True)
-    df.columns.values[1] = 'bcb_expected_inflation'
+    df = _rename_col(df, 1, 'bcb_expected_inflation')
     if load_data:
-        df.to_csv('./data/processed/bcb_expectations_interpolated.csv', index=False)
+        _write_csv(df, './data/processed/bcb_expectations_interpolated.csv')
     return df
 
 def resample_daily_to_monthly(df: pd.DataFrame, column: str, load_data: bool) -> pd.DataFrame:
@@ -55,15 +162,15 @@ def resample_daily_to_monthly(df: pd.DataFrame, column: str, load_data: bool) ->
     when use: process selic rate data
     """
     
-    df.columns.values[1] = 'selic_target'
-    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce')
+    df = _rename_col(df, 1, 'selic_target')
+    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce', cache=True)
     df.set_index('Date', inplace=True)
-    df['selic_target'] = df['selic_target'].str.replace(',', '.')
-    df['selic_target'] = pd.to_numeric(df['selic_target'], errors='coerce')
+    df.sort_index(inplace=True) # Monotonic index: resample/shift take their sorted fast paths
+    df['selic_target'] = _decimal_comma_to_float(df['selic_target'])
     df = df.resample('ME').last() # Resample to last day
     df.reset_index(inplace=True)
     if load_data:
-        df.to_csv('./data/processed/selic_target_monthly.csv', index=False)
+        _write_csv(df, './data/processed/selic_target_monthly.csv')
     return df
 
 def process_exchange_rate_data(df: pd.DataFrame, load_data: bool) -> pd.DataFrame:
@@ -72,20 +179,19 @@ def process_exchange_rate_data(df: pd.DataFrame, load_data: bool) -> pd.DataFram
     when use: process exchange rate data
     """
 
-    df.columns.values[1] = 'exchange_rate'
-    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce')
+    df = _rename_col(df, 1, 'exchange_rate')
+    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y', errors='coerce', cache=True)
     df.set_index('Date', inplace=True)
 
-    df['exchange_rate'] = df['exchange_rate'].str.replace(',', '.')
-    df['exchange_rate'] = pd.to_numeric(df['exchange_rate'], errors='coerce')
+    df['exchange_rate'] = _decimal_comma_to_float(df['exchange_rate'])
 
     df.sort_index(inplace=True)
     df = df.resample('ME').mean()
-    df['exchange_rate_var'] = df['exchange_rate'].pct_change(fill_method=None) * 100
+    df['exchange_rate_var'] = _pct_change_100(df['exchange_rate'].to_numpy(dtype=float))
 
     df.reset_index(inplace=True)
     if load_data:
-        df.to_csv('./data/processed/exchange_rate_var.csv', index=False)
+        _write_csv(df, './data/processed/exchange_rate_var.csv')
     return df
 
 def hp_filter_output(df: pd.DataFrame, column: str, lamb, load_data: bool) -> pd.DataFrame:
@@ -93,22 +199,21 @@ def hp_filter_output(df: pd.DataFrame, column: str, lamb, load_data: bool) -> pd
     
     when use: process output gap data
     """
-    from statsmodels.tsa.filters.hp_filter import hpfilter
-
-    df['Date'] = pd.to_datetime(df['Date'], format='%b-%y', errors='coerce')
+    df['Date'] = pd.to_datetime(df['Date'], format='%b-%y', errors='coerce', cache=True)
     
     # Remove rows with NaN values in Data or the target column
     df = df.dropna(subset=['Date', column]).copy()
     
     df.set_index('Date', inplace=True)
-    
+    df.sort_index(inplace=True) # Monotonic index: the HP filter expects an ordered series
+
     _, df['output_potential'] = hpfilter(df[column], lamb=lamb)
 
     df['output_gap'] = df[column] - df['output_potential']
     df.reset_index(inplace=True)
 
     if load_data:
-        df.to_csv('./data/processed/output_gap_hp_filter.csv', index=False)
+        _write_csv(df, './data/processed/output_gap_hp_filter.csv')
     return df
 
 def resample_annualy_to_monthly(df: pd.DataFrame, load_data: bool) -> pd.DataFrame:
@@ -119,9 +224,11 @@ def resample_annualy_to_monthly(df: pd.DataFrame, load_data: bool) -> pd.DataFra
 
     """
     df.rename(columns={df.columns[1]: 'inflation_target', df.columns[2]: 'interval_size'}, inplace=True)
-    df['Date'] = pd.to_datetime(df['Date'], format='%Y', errors='coerce')
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y', errors='coerce', cache=True)
     df.set_index('Date', inplace=True)
-    df = df.resample('MS').asfreq() # Resample to monthly frequency (NaN for missing months)
+    # Reindex to monthly frequency (NaN for missing months) on the shared
+    # month-start grid; the annual stamps land on January 1st
+    df = df.reindex(_monthly_index(df.index.min(), df.index.max()))
     try:
         df['inflation_target'] = pd.to_numeric(df['inflation_target'], errors='coerce')
         df['interval_size'] = pd.to_numeric(df['interval_size'], errors='coerce')
@@ -132,7 +239,7 @@ def resample_annualy_to_monthly(df: pd.DataFrame, load_data: bool) -> pd.DataFra
     df['lower_limit'] = df['inflation_target'] - df['interval_size']
     df.reset_index(inplace=True)
     if load_data:
-        df.to_csv('./data/processed/inflation_target_monthly.csv', index=False)
+        _write_csv(df, './data/processed/inflation_target_monthly.csv')
     return df
 
 def process_inflation(df: pd.DataFrame, load_data: bool) -> pd.DataFrame:
@@ -140,13 +247,14 @@ def process_inflation(df: pd.DataFrame, load_data: bool) -> pd.DataFrame:
     
     when use: process inflation data
     """
-    df.columns.values[1] = 'inflation_12m'
-    df['Date'] = pd.to_datetime(df['Date'], format='%m/%Y', errors='coerce')
+    df = _rename_col(df, 1, 'inflation_12m')
+    df['Date'] = pd.to_datetime(df['Date'], format='%m/%Y', errors='coerce', cache=True)
     df.set_index('Date', inplace=True)
-    df['inflation_12m'] = pd.to_numeric(df['inflation_12m'].str.replace(',', '.'), errors='coerce')
+    df.sort_index(inplace=True) # Monotonic index for the downstream merge alignment
+    df['inflation_12m'] = _decimal_comma_to_float(df['inflation_12m'])
     df.reset_index(inplace=True)
     if load_data:
-        df.to_csv('./data/processed/inflation_12m.csv', index=False)
+        _write_csv(df, './data/processed/inflation_12m.csv')
     return df
 
 
@@ -155,14 +263,17 @@ def merge_datasets(dfs: list[pd.DataFrame], load_data: bool) -> pd.DataFrame:
     
     when use: merge all processed datasets into a final dataframe
     """
-    from functools import reduce
-
     for df in dfs:
         df['Date'] = df['Date'].dt.to_period('M')
-    df_merged = reduce(lambda left, right: pd.merge(left, right, on='Date', how='left'), dfs)
+    # One multi-frame join on the shared PeriodIndex (integer ordinals)
+    # instead of N-1 intermediate merges that each rehash 'Date'
+    # sort_index marks each index monotonic, so the join aligns sorted
+    # ranges instead of building hash tables
+    indexed = [df.set_index('Date').sort_index() for df in dfs]
+    df_merged = indexed[0].join(indexed[1:], how='left').reset_index()
 
     if load_data:
-        df_merged.to_csv('./data/processed/final_merged_dataset.csv', index=False)
+        _write_csv(df_merged, './data/processed/final_merged_dataset.csv')
     
     return df_merged
 
@@ -175,15 +286,41 @@ def calculate_deviation_from_target(df_final: pd.DataFrame, load_data: bool) ->
     when use: calculate deviation for focus and bcb expected inflation data
     """
 
-    df_final = df_final.copy()
-    df_final['ano'] = df_final['Date'].dt.year
-    df_final['mes'] = df_final['Date'].dt.month
-    df_final['inflation_target_next'] = df_final.groupby('mes')['inflation_target'].shift(-1)
-    df_final['bcb_inflation_deviation'] = ((12-df_final['mes']) / 12 ) * (df_final['bcb_expected_inflation'] - df_final['inflation_target']) + (df_final['mes'] / 12) * (df_final['bcb_expected_inflation'] - df_final['inflation_target_next'])
-    df_final['focus_inflation_deviation'] = ((12-df_final['mes']) / 12 ) * (df_final['focus_expected_inflation'] - df_final['inflation_target']) + (df_final['mes'] / 12) * (df_final['focus_expected_inflation'] - df_final['inflation_target_next'])
+    # Shallow copy: under copy-on-write the caller's blocks are shared and
+    # only the derived columns added below materialise new buffers
+    df_final = df_final.copy(deep=False)
+    # Years fit in int16 (and 'Date' is never null here), shrinking the key
+    # column the estimation range-masks scan; 'mes' is already stored as a
+    # Categorical whose codes are int8
+    df_final['ano'] = df_final['Date'].dt.year.astype('int16')
+    months = df_final['Date'].dt.month
+    # Low-cardinality key: storing the months as a fixed-category Categorical
+    # hands any later groupby its codes array for free (no factorize pass)
+    df_final['mes'] = pd.Categorical(months, categories=range(1, 13))
+    # The target is constant within a calendar year, so next year's target is
+    # a plain year lookup — no groupby('mes') shift, which also skipped years
+    # when a meeting month had no counterpart in the following year
+    year_target = df_final.groupby('ano')['inflation_target'].first()
+    df_final['inflation_target_next'] = (df_final['ano'] + 1).map(year_target)
+
+    mes = months.to_numpy(dtype=float)
+    target = df_final['inflation_target'].to_numpy(dtype=float)
+    target_next = df_final['inflation_target_next'].to_numpy(dtype=float)
+    bcb = df_final['bcb_expected_inflation'].to_numpy(dtype=float)
+    focus = df_final['focus_expected_inflation'].to_numpy(dtype=float)
+    if _HAS_NUMBA:
+        df_final['bcb_inflation_deviation'] = _deviation(mes, bcb, target, target_next)
+        df_final['focus_inflation_deviation'] = _deviation(mes, focus, target, target_next)
+    else:
+        # Single NumPy expression per deviation column instead of pandas
+        # broadcasting through several intermediate Series
+        weight_next = mes / 12
+        weight_current = (12 - mes) / 12
+        df_final['bcb_inflation_deviation'] = weight_current * (bcb - target) + weight_next * (bcb - target_next)
+        df_final['focus_inflation_deviation'] = weight_current * (focus - target) + weight_next * (focus - target_next)
 
     if load_data:
-        df_final.to_csv('./data/processed/final_merged_dataset.csv', index=False)
+        _write_csv(df_final, './data/processed/final_merged_dataset.csv')
         print("final file dataset was updated")
     else: 
         print("final file dataset was not saved")
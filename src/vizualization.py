@@ -1,127 +1,114 @@
 # Plots
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.path import Path
 
 # plt.style.use('../data/plots/plot_style.mplstyle')
 
+# Shared figure style, applied once per figure through rc_context instead of
+# re-setting facecolors, spines and grid attribute-by-attribute in every plot
+_STYLE = {
+    'figure.facecolor': '#FAFAF8',
+    'axes.facecolor': '#FAFAF8',
+    'axes.spines.top': False,
+    'axes.spines.right': False,
+    'axes.spines.left': False,
+    'axes.grid': True,
+    'axes.grid.axis': 'y',
+    'axes.axisbelow': True,
+    'grid.color': '#D9D9D9',
+    'grid.linestyle': '-',
+    'grid.linewidth': 0.5,
+    'grid.alpha': 0.6,
+}
+
+
+def _make_fig(nrows: int = 1, ncols: int = 1, figsize=(12, 6)):
+    """Create a pre-styled figure (with the green header rule) and its axes."""
+    import matplotlib.pyplot as plt
+
+    with plt.rc_context(_STYLE):
+        fig, axes = plt.subplots(nrows, ncols, figsize=figsize)
+    fig.add_artist(plt.Line2D([0.05, 0.95], [0.96, 0.96], color="#44FF00", lw=3, transform=fig.transFigure)) #----
+    return fig, axes
+
+
 class Plotter:
+    """matplotlib is imported inside each plot method so ETL-only
+    entrypoints never pay its import cost."""
+
     def __init__(self, data):
         self.data = data
-    
+
     def plot_inflation(self, load_data: bool):
         """Plot inflation rate against target and expected inflation.
-        
+
         when use: visualize inflation data eda
         """
-
         self.data['Date'] = self.data['Date'].dt.to_timestamp()
 
-        fig = plt.figure(figsize=(12, 6), facecolor="#FAFAF8")
+        fig, ax = _make_fig()
 
-        fig.add_artist(plt.Line2D([0.05, 0.95], [0.96, 0.96], color= "#44FF00", lw=3, transform=fig.transFigure)) #----
+        # Mask the tolerance-band rows once instead of one dropna per series
+        has_limit = self.data['upper_limit'].notna().to_numpy()
+        limit_dates = self.data['Date'].to_numpy()[has_limit]
+        ax.plot(self.data['Date'], self.data['inflation_12m'], label='12-Month Inflation Rate', color='blue')
 
-        ax = plt.gca()
-        ax.set_facecolor("#FAFAF8")
-        
-        plt.plot(self.data['Date'], self.data['inflation_12m'], label='12-Month Inflation Rate', color='blue')
+        ax.plot(limit_dates, self.data['inflation_target'].to_numpy()[has_limit], label='Inflation Target', color='orange')
 
-        plt.plot(self.data.dropna(subset=['upper_limit'])['Date'], self.data.dropna(subset=['upper_limit'])['inflation_target'], label='Inflation Target', color='orange')
+        ax.plot(self.data['Date'], self.data['focus_expected_inflation'], label='Expected Inflation', color='green', linestyle='--')
 
-        plt.plot(self.data['Date'], self.data['focus_expected_inflation'], label='Expected Inflation', color='green', linestyle='--')
-        
-        plt.plot(self.data.dropna(subset=['upper_limit'])['Date'], self.data.dropna(subset=['upper_limit'])['lower_limit'], label='Lower Limit', color='red', linestyle=':')
-        plt.plot(self.data.dropna(subset=['upper_limit'])['Date'], self.data.dropna(subset=['upper_limit'])['upper_limit'], label='Upper Limit', color='red', linestyle=':')
+        ax.plot(limit_dates, self.data['lower_limit'].to_numpy()[has_limit], label='Lower Limit', color='red', linestyle=':')
+        ax.plot(limit_dates, self.data['upper_limit'].to_numpy()[has_limit], label='Upper Limit', color='red', linestyle=':')
 
-        plt.title('Inflation Rate vs Target')
-        plt.xlabel('Date')
-        plt.ylabel('Inflation Rate (%)')
-        plt.legend()
-        
-        # Remover spines (bordas)
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_visible(False)
-        
-        # Apenas grid horizontal, sutil
-        ax.grid(True, axis='y', color="#D9D9D9", linestyle="-", linewidth=0.5, zorder=0, alpha=0.6)
+        ax.set_title('Inflation Rate vs Target')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Inflation Rate (%)')
+        ax.legend()
 
         if load_data:
-            plt.savefig('./data/plots/inflation_vs_target.png')
+            fig.savefig('./data/plots/inflation_vs_target.png')
 
     def plot_selic(self, load_data: bool):
         """Plot SELIC rate against Taylor Rule suggested rate.
-        
+
         when use: visualize selic data eda
         """
+        fig, ax = _make_fig()
 
-        fig = plt.figure(figsize=(12, 6), facecolor="#FAFAF8")
+        ax.plot(self.data['Date'], self.data['selic_target'], label='SELIC Rate', color='blue')
 
-        fig.add_artist(plt.Line2D([0.05, 0.95], [0.96, 0.96], color= "#44FF00", lw=3, transform=fig.transFigure)) #----
-
-        ax = plt.gca()
-        ax.set_facecolor("#FAFAF8")
-        
-        plt.plot(self.data['Date'], self.data['selic_target'], label='SELIC Rate', color='blue')
-
-        plt.title('SELIC Rate vs Taylor Rule Suggested Rate')
-        plt.xlabel('Date')
-        plt.ylabel('Interest Rate (%)')
-        plt.legend()
-        
-        # Remover spines (bordas)
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_visible(False)
-        
-        # Apenas grid horizontal, sutil
-        ax.grid(True, axis='y', color="#D9D9D9", linestyle="-", linewidth=0.5, zorder=0, alpha=0.6)
+        ax.set_title('SELIC Rate vs Taylor Rule Suggested Rate')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Interest Rate (%)')
+        ax.legend()
 
         if load_data:
-            plt.savefig('./data/plots/selic_vs_taylor.png')
-        
+            fig.savefig('./data/plots/selic_vs_taylor.png')
 
     def plot_output_and_exchange(self, load_data: bool):
         """Plot output gap and exchange rate over time.
-        
+
         when use: visualize output gap and exchange rate data eda
         """
+        import matplotlib.pyplot as plt
 
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 6), facecolor="#FAFAF8")
-
-        fig.add_artist(plt.Line2D([0.05, 0.95], [0.96, 0.96], color="#44FF00", lw=3, transform=fig.transFigure))
+        fig, (ax1, ax2) = _make_fig(1, 2, figsize=(18, 6))
 
         # Plot 1: Output Gap and Output
-        ax1.set_facecolor("#FAFAF8")
         color = 'tab:blue'
         ax1.set_ylabel('Output Gap (%)', color=color)
         ax1.plot(self.data['Date'], self.data['output_gap'], color=color, label='Output Gap')
         ax1.tick_params(axis='y', labelcolor=color)
         ax1.set_title('Output Gap and Output')
-        
 
         # Plot 2: Exchange Rate Var and Exchange Rate
-        ax2.set_facecolor("#FAFAF8")
         color = 'tab:orange'
         ax2.set_ylabel('Exchange Rate Variation (%)', color=color)
         ax2.plot(self.data['Date'], self.data['exchange_rate_var'], color=color, label='Exchange Rate Variation')
         ax2.tick_params(axis='y', labelcolor=color)
         ax2.set_title('Exchange Rate Variation and Exchange Rate')
 
-
-        # Remove spines
-        for ax in [ax1, ax2]:
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_visible(False)
-        
-        # Grid
-        ax1.grid(True, axis='y', color="#D9D9D9", linestyle="-", linewidth=0.5, zorder=0, alpha=0.6)
-        ax2.grid(True, axis='y', color="#D9D9D9", linestyle="-", linewidth=0.5, zorder=0, alpha=0.6)
-
-        plt.suptitle('Output Gap and Exchange Rate Over Time')
-        plt.tight_layout()
+        fig.suptitle('Output Gap and Exchange Rate Over Time')
+        fig.tight_layout()
 
         if load_data:
-            plt.savefig('./data/plots/output_gap_and_exchange_rate.png')
-        plt.show()
\ No newline at end of file
+            fig.savefig('./data/plots/output_gap_and_exchange_rate.png')
+        plt.show()